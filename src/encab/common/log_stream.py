@@ -1,15 +1,79 @@
+import os
 import sys
+import time
+import codecs
+import traceback
 
-from typing import Dict, Optional, IO
+from typing import Any, Dict, Iterable, Optional, IO, Tuple, Callable
 
-from threading import Thread, Event
+from queue import Queue
+from threading import Thread, Event, Lock
+from selectors import DefaultSelector, EVENT_READ
 
 from logging import Logger
 
+BUFFER_SIZE = 65536
+"""maximum number of bytes read and logged at once"""
+
+QUEUE_SIZE = 1024
+"""maximum number of chunks read but not yet logged by a :class:`LogMultiplexer`"""
+
+PARTIAL_LINE_TIMEOUT = 0.5
+"""seconds a :class:`LogMultiplexer` waits for the end of a line before logging what it has"""
+
+ENCODING = sys.getdefaultencoding()
+"""the encoding of program output"""
+
+
+def log_lines(
+    logger: Logger,
+    level: int,
+    lines: Iterable[str],
+    extra: Any,
+    pathname: str,
+    func: str,
+):
+    """
+    Logs each line as a record of its own, without trailing whitespace.
+    The caller checks whether the logger logs the level at all.
+
+    :param logger: the logger
+    :type logger: Logger
+    :param level: the log level
+    :type level: int
+    :param lines: the lines to be logged
+    :type lines: Iterable[str]
+    :param extra: the extra field for the log records
+    :type extra: Any
+    :param pathname: the source file the records are attributed to
+    :type pathname: str
+    :param func: the function the records are attributed to
+    :type func: str
+    """
+    # the records are made directly since looking up the caller is pointless here
+    for line in lines:
+        record = logger.makeRecord(
+            logger.name,
+            level,
+            pathname,
+            0,
+            line.rstrip("\r\n\t "),
+            (),
+            None,
+            func,
+            extra,
+        )
+        logger.handle(record)
+
 
 class LogStream(object):
     """
-    Reads from a stream in a background thread and logs the result line by line
+    Reads from a stream in a background thread and logs the result line by line.
+
+    The stream is read in chunks of up to :data:`BUFFER_SIZE` bytes,
+    so each chunk is decoded once no matter how many lines it contains.
+    Undecodable bytes are replaced instead of stopping the stream.
+    If the logger doesn't log the log level, the stream is drained without decoding.
     """
 
     def __init__(
@@ -25,38 +89,116 @@ class LogStream(object):
         self.log_level = log_level
         self.stream = stream
         self.extra = extra
-        self.thread: Optional[Thread] = None
+        self._started = False
         self._closed = Event()
+        self._decoder = codecs.getincrementaldecoder(ENCODING)(errors="replace")
+        self._buffer = ""
+        self._new_partial_line = False
+        self._emit: Callable[[str], None] = self._log_lines
 
-    def _run(self):
+    def _log_lines(self, text: str):
+        if self.logger.isEnabledFor(self.log_level):
+            log_lines(
+                self.logger,
+                self.log_level,
+                text.split("\n"),
+                self.extra,
+                __file__,
+                "_log_lines",
+            )
+
+    def _read_chunk(self) -> bool:
+        chunk = os.read(self.stream.fileno(), BUFFER_SIZE)
+
+        if not chunk:
+            buffer = self._buffer + self._decoder.decode(b"", True)
+            self._buffer = ""
+            if buffer:
+                self._emit(buffer)
+            return False
+
+        if not self.logger.isEnabledFor(self.log_level):
+            # drain without decoding, the lines would be dropped anyway
+            self._buffer = ""
+            self._decoder.reset()
+            return True
+
+        buffer = self._buffer + self._decoder.decode(chunk)
+        end = buffer.rfind("\n")
+        if end >= 0:
+            self._emit(buffer[:end])
+            buffer = buffer[end + 1 :]
+            self._new_partial_line = True
+        elif len(buffer) >= BUFFER_SIZE:
+            self._emit(buffer)
+            buffer = ""
+            self._new_partial_line = True
+        else:
+            self._new_partial_line = False
+
+        self._buffer = buffer
+        return True
+
+    def read(self) -> bool:
+        """
+        reads the next chunk from the stream and logs all complete lines.
+        Blocks if no data is available.
+
+        :return: False if the stream has ended or failed, True otherwise
+        :rtype: bool
+        """
         try:
-            for line in self.stream:
-                strline = line.decode(sys.getdefaultencoding()).rstrip("\r\n\t ")
-                self.logger.log(self.log_level, strline, extra=self.extra)
+            return self._read_chunk()
         except ValueError:
             pass  # stream was closed
-        except OSError:
+        except OSError as e:
             self.logger.exception(
-                "I/O Error while logging: %s", self.name, extra=self.extra  # type: ignore
+                "I/O Error while logging: %s", str(e), extra=self.extra
             )
-        except:
+        except Exception:
             self.logger.exception(
                 "Something went wrong while logging", extra=self.extra
             )
-            raise
-        finally:
+        return False
+
+    def has_partial_line(self) -> bool:
+        """
+        :return: True if the end of the last line read is still missing
+        :rtype: bool
+        """
+        return bool(self._buffer)
+
+    def has_new_partial_line(self) -> bool:
+        """
+        :return: True if the end of the last line read is missing
+            and that line began in the last chunk read
+        :rtype: bool
+        """
+        return self._new_partial_line and bool(self._buffer)
+
+    def flush(self):
+        """logs the partial line read so far"""
+        buffer = self._buffer
+        self._buffer = ""
+        if buffer:
+            self._emit(buffer)
+
+    def close(self):
+        """closes the stream"""
+        try:
             self.stream.close()
+        finally:
             self._closed.set()
 
-    def start(self):
-        """starts reading and logging"""
-        program = self.extra.get("program", "")
-        name = f"{program}:{self.log_level}"
-        thread = Thread(target=lambda: self._run(), name=name)
-        thread.daemon = True
-        self.thread = thread
-        thread.start()
-        return self
+    def start(self) -> "LogStream":
+        """
+        starts reading and logging in the background thread
+        shared by all streams (see :func:`log_multiplexer`)
+
+        :return: the stream
+        :rtype: LogStream
+        """
+        return log_multiplexer().add(self)
 
     def wait_close(self, wait_time: float = 1.0):
         """
@@ -65,8 +207,213 @@ class LogStream(object):
         :param wait_time: timeout in seconds, defaults to 1.0
         :type wait_time: float, optional
         """
+        if self._started:
+            self._closed.wait(wait_time)
+
+
+class LogMultiplexer(object):
+    """
+    Reads from any number of streams in a single background thread
+    and logs the result line by line.
+
+    The streams are watched with a selector (epoll on Linux),
+    so all supervised processes share one log thread
+    instead of running one thread per pipe.
+    Streams can be added at any time, the thread is started with the first stream.
+
+    The lines read are logged by a second thread, so slow log handlers
+    don't hold up reading. Both threads are connected by a queue of
+    at most :data:`QUEUE_SIZE` chunks. If it is full, reading stops
+    until the log handlers have caught up, which blocks the processes
+    once their pipes are full.
+
+    A line that isn't finished within :data:`PARTIAL_LINE_TIMEOUT` seconds
+    is logged as it is, so output without a trailing newline,
+    e.g. a crash message, shows up right away and not on exit.
+
+    :meth:`close` stops both threads and releases the selector.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        :param str name: the name of the background thread
+        """
+        self.name = name
+        self.thread: Optional[Thread] = None
+        self.dispatch_thread: Optional[Thread] = None
+        self._lock = Lock()
+        self._closing = False
+        self._queue: "Queue[Optional[Tuple[LogStream, Optional[str]]]]" = Queue(
+            QUEUE_SIZE
+        )
+        self._selector = DefaultSelector()
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        os.set_blocking(self._wakeup_write, False)
+        self._selector.register(self._wakeup_read, EVENT_READ, None)
+
+    def add(self, stream: LogStream) -> LogStream:
+        """
+        adds a stream and starts reading and logging it
+
+        :param stream: the stream
+        :type stream: LogStream
+        :return: the stream
+        :rtype: LogStream
+        """
+        stream._started = True
+        stream._emit = lambda text: self._queue.put((stream, text))
+
+        with self._lock:
+            if self._closing:
+                stream.close()
+                return stream
+
+            try:
+                self._selector.register(stream.stream.fileno(), EVENT_READ, stream)
+            except ValueError:
+                stream.close()  # stream was closed
+                return stream
+
+            if not self.thread:
+                dispatch_thread = Thread(
+                    target=self._dispatch, name=f"{self.name}:dispatch", daemon=True
+                )
+                self.dispatch_thread = dispatch_thread
+                dispatch_thread.start()
+
+                thread = Thread(target=self._run, name=self.name, daemon=True)
+                self.thread = thread
+                thread.start()
+
+        self._wakeup()
+        return stream
+
+    def close(self):
+        """
+        stops reading and logging.
+        Streams that are still open are logged up to the last line read and closed.
+        """
+        with self._lock:
+            if self._closing:
+                return
+            self._closing = True
+            thread = self.thread
+            dispatch_thread = self.dispatch_thread
+
+        if thread and dispatch_thread:
+            self._wakeup()
+            thread.join()
+            dispatch_thread.join()
+        else:
+            self._close_selector()
+
+    def _close_selector(self):
+        self._selector.close()
+        os.close(self._wakeup_read)
+        os.close(self._wakeup_write)
+
+    def _wakeup(self):
         try:
-            if self.thread:
-                self._closed.wait(wait_time)
-        except IOError:
-            pass
+            os.write(self._wakeup_write, b"\0")
+        except BlockingIOError:
+            pass  # a wakeup is pending anyway
+
+    def _run(self) -> None:
+        # the time at which the partial line of each stream is logged unfinished
+        deadlines: Dict[LogStream, float] = dict()
+
+        while not self._closing:
+            timeout = (
+                max(min(deadlines.values()) - time.monotonic(), 0)
+                if deadlines
+                else None
+            )
+            events = self._selector.select(timeout)
+
+            for key, _ in events:
+                stream = key.data
+                if stream is None:
+                    os.read(self._wakeup_read, BUFFER_SIZE)
+                elif not self._read(stream):
+                    with self._lock:
+                        self._selector.unregister(key.fd)
+                    self._queue.put((stream, None))
+                    deadlines.pop(stream, None)
+                elif not stream.has_partial_line():
+                    deadlines.pop(stream, None)
+                elif stream not in deadlines or stream.has_new_partial_line():
+                    deadlines[stream] = time.monotonic() + PARTIAL_LINE_TIMEOUT
+
+            if deadlines:
+                now = time.monotonic()
+                for stream in [s for s, t in deadlines.items() if t <= now]:
+                    stream.flush()
+                    del deadlines[stream]
+
+        with self._lock:
+            streams = [key.data for key in self._selector.get_map().values()]
+            self._close_selector()
+
+        for stream in streams:
+            if stream is not None:
+                stream.flush()
+                self._queue.put((stream, None))
+
+        self._queue.put(None)  # stops the dispatch thread
+
+    def _read(self, stream: LogStream) -> bool:
+        try:
+            return stream.read()
+        except Exception:
+            # a failing stream must not stop the other streams
+            _log_failure(stream, "Something went wrong while reading")
+            return False
+
+    def _dispatch(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            stream, text = item
+            try:
+                if text is not None:
+                    stream._log_lines(text)
+            except Exception:
+                # a failing handler must not stop the other streams
+                _log_failure(stream, "Something went wrong while logging")
+            finally:
+                if text is None:
+                    self._close(stream)
+
+    def _close(self, stream: LogStream):
+        try:
+            stream.close()
+        except Exception:
+            _log_failure(stream, "Failed to close the stream")
+
+
+def _log_failure(stream: LogStream, message: str):
+    try:
+        stream.logger.exception(message, extra=stream.extra)
+    except Exception:
+        traceback.print_exc()  # the logger itself fails
+
+
+_log_multiplexer: Optional[LogMultiplexer] = None
+"""The multiplexer that reads the output of all processes, see :func:`log_multiplexer`"""
+
+_log_multiplexer_lock = Lock()
+
+
+def log_multiplexer() -> LogMultiplexer:
+    """
+    :return: the multiplexer that reads the output of all processes, created on first use
+    :rtype: LogMultiplexer
+    """
+    global _log_multiplexer
+
+    with _log_multiplexer_lock:
+        if _log_multiplexer is None:
+            _log_multiplexer = LogMultiplexer("log")
+        return _log_multiplexer
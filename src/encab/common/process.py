@@ -1,9 +1,11 @@
 import os
+import sys
 import pwd
 
+from functools import lru_cache
 from typing import Dict, Optional, Callable, Any, List, Union
 
-from subprocess import Popen, PIPE
+from subprocess import Popen, PIPE, DEVNULL
 from signal import SIGKILL, SIGTERM
 
 from logging import Logger, INFO, ERROR
@@ -14,6 +16,7 @@ from pwd import getpwnam
 from grp import getgrnam
 
 
+@lru_cache(maxsize=256)
 def getGroupId(name: str) -> int:
     """
     returns the GID for the group name
@@ -29,6 +32,7 @@ def getGroupId(name: str) -> int:
     return getgrnam(name).gr_gid
 
 
+@lru_cache(maxsize=256)
 def getUserId(name: str) -> int:
     """
     returns the UID for the user name
@@ -44,6 +48,25 @@ def getUserId(name: str) -> int:
     return getpwnam(name).pw_uid
 
 
+@lru_cache(maxsize=256)
+def getUserData(uid: int) -> pwd.struct_passwd:
+    """
+    returns the passwd entry for the UID
+
+    for details see https://docs.python.org/3/library/pwd.html
+
+    :param uid: the UID
+    :type uid: int
+    :return: the passwd entry
+    :rtype: pwd.struct_passwd
+    :raises ValueError: The UID cannot be found in the /etc/passwd file
+    """
+    try:
+        return pwd.getpwuid(uid)
+    except KeyError as e:
+        raise ValueError(f"No passwd entry for user id: {uid}", e)
+
+
 class Process(object):
     """
     Wrapper for POpen that is backward compatible to Python 3.7.
@@ -72,11 +95,7 @@ class Process(object):
             os.setgid(group)
 
         if user and os.getuid() != user:
-            try:
-                user_data = pwd.getpwuid(user)
-            except KeyError as e:
-                raise ValueError(f"No passwd entry for user id: {user}", e)
-
+            user_data = getUserData(user)
             os.initgroups(user_data.pw_name, user_data.pw_gid)
             os.setuid(user)
 
@@ -118,6 +137,7 @@ class Process(object):
         :type cwd: Optional[str], optional
         :param reap_zombies: if True, encab will reap zombie child processes
         :type reap_zombies: bool, defaults to False
+        :raises ValueError: The UID cannot be found in the /etc/passwd file
         """
         self._args = args
         self._env = environment
@@ -129,6 +149,61 @@ class Process(object):
         self._process: Optional[Popen] = None
         self._cwd = cwd
         self._reap_zombies = reap_zombies
+        self._credentials = Process._credentials_args(user, group, umask)
+
+    @staticmethod
+    def _credentials_args(
+        uid: Optional[int], gid: Optional[int], umask: Optional[int]
+    ) -> Dict[str, Any]:
+        """
+        Computes the Popen arguments that switch user, group and umask of the child process.
+        Only the settings that are actually needed are included.
+
+        :param uid: the UID for the process
+        :type uid: Optional[int]
+        :param gid: the GID of the process
+        :type gid: Optional[int]
+        :param umask: the process permissions
+        :type umask: Optional[int]
+        :raises ValueError: The UID cannot be found in the /etc/passwd file
+        :return: the Popen keyword arguments
+        :rtype: Dict[str, Any]
+        """
+        if umask == -1:
+            umask = None
+
+        user_data = getUserData(uid) if uid and os.getuid() != uid else None
+        credentials: Dict[str, Any] = dict()
+
+        if sys.version_info >= (3, 9):
+            # Popen switches user, group and umask in C, no Python code runs in the child
+            if gid:
+                credentials["group"] = gid
+
+            if user_data:
+                credentials["extra_groups"] = os.getgrouplist(
+                    user_data.pw_name, user_data.pw_gid
+                )
+                credentials["user"] = uid
+
+            if umask:
+                credentials["umask"] = umask
+        elif gid or user_data or umask:
+
+            def preexec_fn():
+                if gid:
+                    os.setgid(gid)
+
+                if user_data:
+                    os.initgroups(user_data.pw_name, user_data.pw_gid)
+                    os.setuid(uid)
+
+                if umask:
+                    os.umask(umask)
+
+            credentials["preexec_fn"] = preexec_fn
+
+        return credentials
 
     def _wait_and_reap_zombies(self, logger: Logger, extra: Dict[str, str]) -> int:
         """
@@ -146,39 +221,34 @@ class Process(object):
         child_process_pid = self._process.pid
 
         while True:
-            current_pid, status = os.waitpid(-child_process_pid, os.WUNTRACED)
-            if current_pid == -1:
+            try:
+                current_pid, status = os.waitpid(-child_process_pid, os.WUNTRACED)
+            except ChildProcessError:
                 logger.debug("No child to wait", extra=extra)
                 return EX_NOCHILD
-            elif current_pid == 0:
-                pass
-            else:
-                if current_pid == child_process_pid:
-                    if os.WIFEXITED(status):
-                        rc = os.waitstatus_to_exitcode(status)
-                        logger.debug(
-                            "Main child exited normally (with status %d, exit code %d)",
-                            os.WEXITSTATUS(status),
-                            rc,
-                            extra=extra,
-                        )
-                        return rc
-                    elif os.WIFSIGNALED(status):
-                        logger.debug(
-                            "Main child exited with signal (with signal '%s')",
-                            str(os.WTERMSIG(status)),
-                            extra=extra,
-                        )
-                        return os.waitstatus_to_exitcode(status)
-                    else:
-                        logger.error(
-                            "Main child exited for unknown reason", extra=extra
-                        )
-                        return os.waitstatus_to_exitcode(status)
-                else:
-                    logger.warning(
-                        "Reaped child with pid: %d", current_pid, extra=extra
+
+            if current_pid == child_process_pid:
+                if os.WIFEXITED(status):
+                    rc = os.waitstatus_to_exitcode(status)
+                    logger.debug(
+                        "Main child exited normally (with status %d, exit code %d)",
+                        os.WEXITSTATUS(status),
+                        rc,
+                        extra=extra,
+                    )
+                    return rc
+                elif os.WIFSIGNALED(status):
+                    logger.debug(
+                        "Main child exited with signal (with signal '%s')",
+                        str(os.WTERMSIG(status)),
+                        extra=extra,
                     )
+                    return os.waitstatus_to_exitcode(status)
+                else:
+                    logger.error("Main child exited for unknown reason", extra=extra)
+                    return os.waitstatus_to_exitcode(status)
+            else:
+                logger.warning("Reaped child with pid: %d", current_pid, extra=extra)
 
     def execute(
         self,
@@ -188,6 +258,7 @@ class Process(object):
         stdin: Optional[int] = None,
         stdout: Optional[int] = None,
         stderr: Optional[int] = None,
+        bufsize: int = -1,
     ) -> int:
         """
         Executes the process
@@ -207,41 +278,22 @@ class Process(object):
         :type stdout: Optional[int], optional
         :param stderr: the stderr file descriptor, defaults to None
         :type stderr: Optional[int], optional
-        :raises ValueError: The UID cannot be found in the /etc/passwd file
+        :param bufsize: the buffer size of the pipe file objects, 0 means unbuffered, defaults to -1
+        :type bufsize: int, optional
         :return: the process exit code
         :rtype: int
         """
-        uid = self._user
-        gid = self._group
-        umask = self._umask
-
-        if uid and os.getuid() != uid:
-            try:
-                user_data = pwd.getpwuid(uid)
-            except KeyError as e:
-                raise ValueError(f"No passwd entry for user id: {uid}", e)
-
-        def preexec_fn():
-            if gid:
-                os.setgid(gid)
-
-            if uid and user_data:
-                os.initgroups(user_data.pw_name, user_data.pw_gid)
-                os.setuid(uid)
-
-            if umask and umask != -1:
-                os.umask(umask)
-
         self._process = Popen(
             self._args,
             stdin=stdin,
             stdout=stdout,
             stderr=stderr,
+            bufsize=bufsize,
             env=self._env,
-            preexec_fn=preexec_fn,
             shell=self._shell,
             start_new_session=self._start_new_session,
             cwd=self._cwd,
+            **self._credentials,
         )
         exec(self._process)
 
@@ -261,13 +313,17 @@ class Process(object):
         """
         Executes the process and loggs stderr (log level ERROR) and optionally stdout (log level INFO)
 
+        The streams are read by the background thread shared by all processes
+        (see :func:`encab.common.log_stream.log_multiplexer`).
+        The pipes are unbuffered since they are read in large chunks anyway.
+
         :param exec: function that is called when the process has started
         :type exec: Callable[[Popen], Any]
         :param logger: the logger where stderr and optionally stdout are logget to
         :type logger: Logger
         :param extra: The extra field for log messages
         :type extra: Any
-        :param log_stdout: if True, srdout is logged as well, defaults to True
+        :param log_stdout: if True, srdout is logged as well, otherwise it is discarded, defaults to True
         :type log_stdout: bool, optional
         :return: _description_
         :rtype: int
@@ -276,18 +332,20 @@ class Process(object):
         streams: List[LogStream] = list()
 
         def outer_exec(process: Popen) -> None:
-            assert process.stdout
             assert process.stderr
 
             streams.append(LogStream(logger, ERROR, process.stderr, extra).start())
 
             if log_stdout:
+                assert process.stdout
                 streams.append(LogStream(logger, INFO, process.stdout, extra).start())
 
             exec(process)
 
+        stdout = PIPE if log_stdout else DEVNULL
+
         try:
-            return self.execute(outer_exec, logger, extra, None, PIPE, PIPE)
+            return self.execute(outer_exec, logger, extra, None, stdout, PIPE, 0)
         finally:
             for stream in streams:
                 stream.wait_close()
@@ -297,7 +355,8 @@ class Process(object):
         :return: the operating system process id or None, if the process isn't running.
         :rtype: Optional[int]
         """
-        return self._process.pid if self._process and self._process.pid else None
+        process = self._process
+        return process.pid if process and process.pid else None
 
     def if_running(self, f: Callable[[int], Any]) -> Any:
         """
@@ -308,7 +367,8 @@ class Process(object):
         :return: _description_
         :rtype: whatever is ferurned from the function
         """
-        return f(self._process.pid) if self._process and self._process.pid else None
+        pid = self.pid()
+        return f(pid) if pid else None
 
     def signal(self, signal: int):
         """
@@ -319,10 +379,12 @@ class Process(object):
         :param signal: the signal to be sent
         :type signal: int
         """
-        try:
-            self.if_running(lambda pid: os.kill(pid, signal))
-        except ProcessLookupError:
-            pass
+        pid = self.pid()
+        if pid:
+            try:
+                os.kill(pid, signal)
+            except ProcessLookupError:
+                pass
 
     def kill(self):
         """
@@ -5,16 +5,43 @@ import shlex
 import yaml
 import marshmallow_dataclass
 
+from functools import lru_cache
 from yaml.error import YAMLError
-from typing import Dict, Optional, Union, List, Any
+from typing import Dict, Optional, Union, List, Any, Tuple, Callable
 from dataclasses import dataclass, fields
+from marshmallow import Schema
 from marshmallow.exceptions import MarshmallowError, ValidationError
 from logging import DEBUG, INFO
 from abc import ABC
 
+try:
+    # libyaml based, if available
+    from yaml import CSafeLoader as SafeLoader, CDumper as Dumper
+except ImportError:
+    from yaml import SafeLoader, Dumper  # type: ignore
+
 from .common.process import getUserId, getGroupId
 
 
+ENV_NAME_PATTERN = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+"""valid environment variable names (see POSIX 3.231 Name), to be used with fullmatch"""
+
+_LOG_LEVELS = ("CRITICAL", "FATAL", "ERROR", "WARN", "WARNING", "INFO", "DEBUG")
+"""supported log level names"""
+
+_LOG_LEVEL_SET = frozenset(_LOG_LEVELS)
+
+_LOG_LEVELS_MESSAGE = "Supported levels are: " + ", ".join(_LOG_LEVELS)
+
+_DEFAULT_LOG_FORMAT = "%(levelname)-5.5s %(program)s: %(message)s"
+"""the log format used by default"""
+
+_DEBUG_LOG_FORMAT = (
+    "%(asctime)s %(levelname)-5.5s %(module)s %(program)s %(threadName)s: %(message)s"
+)
+"""the log format used in debug mode"""
+
+
 class ConfigError(ValueError):
     """
     Configuration error
@@ -23,12 +50,65 @@ class ConfigError(ValueError):
     pass
 
 
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """
+    :return: the field names of a dataclass, determined once per class
+    :rtype: Tuple[str, ...]
+    """
+    return tuple(field.name for field in fields(cls))
+
+
+@lru_cache(maxsize=256)
+def _split_command(command: str) -> Tuple[str, ...]:
+    """
+    splits a command string in POSIX shell style, done once per command string
+
+    :param command: the command string
+    :type command: str
+    :return: the command arguments
+    :rtype: Tuple[str, ...]
+    """
+    return tuple(shlex.split(command))
+
+
+def _coerce_id(value: Union[str, int], resolve: Callable[[str], int], kind: str) -> int:
+    """
+    turns a user or group into its id
+
+    :param value: the id or name
+    :type value: Union[str, int]
+    :param resolve: returns the id for a name
+    :type resolve: Callable[[str], int]
+    :param kind: "user" or "group", used in the error message
+    :type kind: str
+    :raises ConfigError: if the name is unknown
+    :return: the id
+    :rtype: int
+    """
+    if isinstance(value, int):
+        return value
+
+    if value.isnumeric():
+        return int(value)
+
+    try:
+        return resolve(value)
+    except KeyError:
+        raise ConfigError(f"Unknown {kind} {value}")
+
+
 @dataclass
 class AbstractConfig(ABC):
     """
     Configuration base dataclass
+
+    The configuration classes declare ``__slots__`` for their fields,
+    so instances have no ``__dict__``.
     """
 
+    __slots__ = ()
+
     @classmethod
     def create(cls, **args):
         """
@@ -37,15 +117,10 @@ class AbstractConfig(ABC):
         :return: the data class
         :rtype: same as cls
         """
-        config_class = dataclass(cls)  # type: ignore
-        config_fields = fields(config_class)
-        all_args = dict(args)
-        for field in config_fields:
-            name = field.name
-            if name not in args:
-                all_args[name] = None
+        all_args = dict.fromkeys(_field_names(cls))
+        all_args.update(args)
 
-        return config_class(**all_args)
+        return cls(**all_args)
 
 
 @dataclass
@@ -54,6 +129,17 @@ class AbstractProgramConfig(AbstractConfig):
     Common config for encab and programs section
     """
 
+    __slots__ = (
+        "environment",
+        "debug",
+        "loglevel",
+        "umask",
+        "user",
+        "group",
+        "join_time",
+        "_unsetFields",
+    )
+
     environment: Optional[Dict[str, str]]
     """set additional environmment variables"""
 
@@ -113,15 +199,10 @@ class AbstractProgramConfig(AbstractConfig):
         user = self.user
 
         if user:
-            if isinstance(user, int) or user.isnumeric():
-                self.user = int(user)
-            else:
-                try:
-                    self.user = getUserId(user)
-                except KeyError:
-                    raise ConfigError(f"Unknown user {user}")
+            self.user = _coerce_id(user, getUserId, "user")
 
-            if user != os.getuid() and os.getuid() != 0:
+            uid = os.getuid()
+            if self.user != uid and uid != 0:
                 raise ConfigError(
                     "Encab has to run as root to run it or programs as different user"
                 )
@@ -139,13 +220,7 @@ class AbstractProgramConfig(AbstractConfig):
         group = self.group
 
         if group:
-            if isinstance(group, int) or group.isnumeric():
-                self.group = int(group)
-            else:
-                try:
-                    self.group = getGroupId(group)
-                except KeyError:
-                    raise ConfigError(f"Unknown group {group}")
+            self.group = _coerce_id(group, getGroupId, "group")
 
     def _set_log_level(self):
         """
@@ -153,15 +228,10 @@ class AbstractProgramConfig(AbstractConfig):
 
         :raises ConfigError: if an unspecified log level is given
         """
-        levels = ["CRITICAL", "FATAL", "ERROR", "WARN", "WARNING", "INFO", "DEBUG"]
-
         level = self.loglevel
 
-        if level and isinstance(level, str) and level not in levels:
-            levels_printed = ", ".join(levels)
-            raise ConfigError(
-                f"Unsupported log level {level}. Supported levels are: {levels_printed}"
-            )
+        if level and isinstance(level, str) and level not in _LOG_LEVEL_SET:
+            raise ConfigError(f"Unsupported log level {level}. {_LOG_LEVELS_MESSAGE}")
 
         self.loglevel = DEBUG if self.debug else (level or INFO)
 
@@ -176,9 +246,8 @@ class AbstractProgramConfig(AbstractConfig):
         if not self.environment:
             return
 
-        pattern = re.compile(r"^[a-zA-Z_]+[a-zA-Z0-9_]*")
         for name in self.environment.keys():
-            if not pattern.match(name):
+            if not ENV_NAME_PATTERN.fullmatch(name):
                 raise ConfigError(
                     "Expected valid environment variable name (see POSIX 3.231 Name)"
                     f" but was '{name}'."
@@ -191,9 +260,9 @@ class AbstractProgramConfig(AbstractConfig):
         :raises ConfigError: if fields have invalid values
         """
 
-        self._unsetFields = [
-            f.name for f in fields(self) if getattr(self, f.name) is None
-        ]
+        self._unsetFields = frozenset(
+            name for name in _field_names(type(self)) if getattr(self, name) is None
+        )
         """name of fields which were not set in this configuration"""
 
         self._set_environment()
@@ -224,10 +293,9 @@ class AbstractProgramConfig(AbstractConfig):
         :type other: AbstractProgramConfig
         """
         for name in self._unsetFields:
-            if hasattr(other, name):
-                v = getattr(other, name)
-                if v is not None:
-                    setattr(self, name, v)
+            v = getattr(other, name, None)
+            if v is not None:
+                setattr(self, name, v)
 
 
 @dataclass
@@ -238,6 +306,8 @@ class EncabConfig(AbstractProgramConfig):
     contains all static settings to start a program
     """
 
+    __slots__ = ("halt_on_exit", "logformat", "dry_run")
+
     halt_on_exit: Optional[bool]
     """halt on exit: if True, encab is halted after the main program ends. Default: False"""
 
@@ -257,16 +327,8 @@ class EncabConfig(AbstractProgramConfig):
     """True: the configuration is checked but no program is started. Default: False"""
 
     def _set_log_format(self):
-        default_format = "%(levelname)-5.5s %(program)s: %(message)s"
-        debug_format = "%(asctime)s %(levelname)-5.5s %(module)s %(program)s %(threadName)s: %(message)s"
-
-        if self.logformat:
-            return
-
-        if self.debug:
-            self.logformat = debug_format
-        else:
-            self.logformat = default_format
+        if not self.logformat:
+            self.logformat = _DEBUG_LOG_FORMAT if self.debug else _DEFAULT_LOG_FORMAT
 
     def __post_init__(self):
         super().__post_init__()
@@ -285,6 +347,15 @@ class ProgramConfig(AbstractProgramConfig):
     contains all static settings to start a program
     """
 
+    __slots__ = (
+        "command",
+        "sh",
+        "startup_delay",
+        "directory",
+        "reap_zombies",
+        "restart_delay",
+    )
+
     command: Union[str, List[str], None]
     """the command to be execution as list in POSIX style
         examples:
@@ -360,12 +431,17 @@ class ProgramConfig(AbstractProgramConfig):
             )
 
         if command:
-            self.command = shlex.split(command) if isinstance(command, str) else command
+            self.command = (
+                list(_split_command(command)) if isinstance(command, str) else command
+            )
 
         if sh:
             self.sh = sh if isinstance(sh, str) else "; ".join(sh)
 
-        self.startup_delay = self.startup_delay or 0
+        self.startup_delay = float(self.startup_delay or 0)
+
+        if self.restart_delay is not None:
+            self.restart_delay = float(self.restart_delay)
 
         if self.reap_zombies and os.getuid() != 0:
             raise ConfigError("Encab has to run as root if reap_zombies is set to True")
@@ -379,6 +455,8 @@ class ExtensionConfig(AbstractConfig):
     represents an extension configuration
     """
 
+    __slots__ = ("enabled", "module", "settings")
+
     enabled: Optional[bool]
     """True: The extension is enabled"""
 
@@ -398,6 +476,8 @@ class Config(AbstractConfig):
     represents a complete Encab configuration
     """
 
+    __slots__ = ("encab", "extensions", "programs")
+
     encab: Optional[EncabConfig]
     """the basic encab configuraion"""
 
@@ -412,19 +492,22 @@ class Config(AbstractConfig):
             self.encab = EncabConfig.create()
 
     @staticmethod
-    def load(stream: io.TextIOBase) -> "Config":
+    def load(stream: Union[io.TextIOBase, io.BufferedIOBase]) -> "Config":
         """
         loads a configuration from a Yaml stream
 
-        :param stream: the Yaml stream
-        :type stream: io.TextIOBase
+        The Yaml stream is read at once and parsed with libyaml
+        if PyYAML was built with it.
+
+        :param stream: the Yaml stream, either text or UTF-8/UTF-16 encoded bytes
+        :type stream: Union[io.TextIOBase, io.BufferedIOBase]
         :raises ConfigError: if the Yaml file is invalid or doesn't match configuration requirements
         :return: the configuration
         :rtype: Config
         """
         try:
-            ConfigSchema = marshmallow_dataclass.class_schema(Config)
-            config = ConfigSchema().load(yaml.safe_load(stream))
+            data = stream.read()
+            config = _config_schema().load(yaml.load(data, Loader=SafeLoader))
             assert isinstance(config, Config)
             return config
         except YAMLError as e:
@@ -432,8 +515,17 @@ class Config(AbstractConfig):
         except ValidationError as e:
             msg = e.args[0]
             if isinstance(msg, dict):
-                msg = yaml.dump(msg, default_flow_style=False)
+                msg = yaml.dump(msg, Dumper=Dumper, default_flow_style=False)
 
             raise ConfigError(f"\n\n{msg}")
         except MarshmallowError as e:
             raise ConfigError(e.args)
+
+
+@lru_cache(maxsize=1)
+def _config_schema() -> Schema:
+    """
+    :return: the schema for :class:`Config`, created on first use
+    :rtype: Schema
+    """
+    return marshmallow_dataclass.class_schema(Config)()
@@ -3,15 +3,18 @@ import os
 import io
 
 from logging import (
+    DEBUG,
     getLogger,
     StreamHandler,
     Formatter,
 )
 
-from signal import SIGTERM, SIGINT, signal, getsignal
-from typing import Optional, List, Tuple, Dict
+from signal import SIGTERM, SIGINT, signal
+from typing import Optional, List, Tuple, Dict, Any
+from functools import lru_cache
 from textwrap import shorten
 from threading import Event
+from types import SimpleNamespace
 
 from .common.process import Process
 from .common.exit_codes import (
@@ -35,6 +38,39 @@ from .ext.startup_script import StarupScriptExtension
 from .ext.log_collector import LogCollectorExtension
 
 
+ENCAB_FILE_DIRECTORIES = (".", "/etc")
+"""directories searched for the configuration file, in this order"""
+
+ENCAB_FILE_NAMES = ("encab.yml", "encab.yaml")
+"""names of the configuration file, in this order"""
+
+ENCAB_FILE_CANDIDATES = tuple(
+    f"{directory}/{name}"
+    for directory in ENCAB_FILE_DIRECTORIES
+    for name in ENCAB_FILE_NAMES
+)
+"""default locations of the configuration file, in this order"""
+
+
+DRY_RUN_VALUES: Dict[str, Optional[bool]] = {"": None, "1": True, "0": False}
+"""values of the environment variable ENCAB_DRY_RUN"""
+
+
+def find_config_file() -> Optional[str]:
+    """
+    Finds the configuration file in the default locations.
+    The first candidate found wins.
+
+    :return: the path of the configuration file or None if there is none
+    :rtype: Optional[str]
+    """
+    for candidate in ENCAB_FILE_CANDIDATES:
+        if os.access(candidate, os.F_OK):
+            return candidate
+
+    return None
+
+
 def load_config(encab_stream: Optional[io.TextIOBase] = None) -> Tuple[Config, str]:
     """
     Loads the configuration file
@@ -60,18 +96,9 @@ def load_config(encab_stream: Optional[io.TextIOBase] = None) -> Tuple[Config, s
             encab_file = os.environ[ENCAB_CONFIG]
             source = f"Environment {ENCAB_CONFIG}"
 
-    ENCAB_FILE_CANDIDATES = [
-        "./encab.yml",
-        "./encab.yaml",
-        "/etc/encab.yml",
-        "/etc/encab.yaml",
-    ]
-
     if not encab_file:
-        for candidate in ENCAB_FILE_CANDIDATES:
-            if os.path.exists(candidate):
-                encab_file = candidate
-                source = "Default location"
+        encab_file = find_config_file()
+        source = "Default location"
 
     if not encab_file:
         candidates = ", ".join(ENCAB_FILE_CANDIDATES)
@@ -80,26 +107,20 @@ def load_config(encab_stream: Optional[io.TextIOBase] = None) -> Tuple[Config, s
     if encab_stream:
         config = Config.load(encab_stream)
     else:
-        with open(encab_file, "r") as f:
+        with open(encab_file, "rb") as f:
             config = Config.load(f)
 
     ENCAB_DRY_RUN = "ENCAB_DRY_RUN"
 
-    dry_run = None
-    if ENCAB_DRY_RUN in os.environ:
-        value = os.environ[ENCAB_DRY_RUN]
-        if not value:
-            pass
-        elif value == "1":
-            dry_run = True
-        elif value == "0":
-            dry_run = False
-        else:
-            raise ConfigError(
-                "Environment variable ENCAB_DRY_RUN"
-                " expected to be '1' or '0' if set"
-                f" but was '{value}'."
-            )
+    value = os.environ.get(ENCAB_DRY_RUN, "")
+    try:
+        dry_run = DRY_RUN_VALUES[value]
+    except KeyError:
+        raise ConfigError(
+            "Environment variable ENCAB_DRY_RUN"
+            " expected to be '1' or '0' if set"
+            f" but was '{value}'."
+        )
 
     assert config.encab
     if dry_run is not None:
@@ -108,6 +129,21 @@ def load_config(encab_stream: Optional[io.TextIOBase] = None) -> Tuple[Config, s
     return (config, f"file {encab_file}, source: {source}.")
 
 
+mylogger = getLogger(ENCAB)
+
+_log_handler: Optional[StreamHandler] = None
+"""the handler that writes the log to stderr, shared by all calls of :func:`set_up_logger`"""
+
+
+@lru_cache(maxsize=8)
+def _formatter(logformat: Optional[str]) -> Formatter:
+    """
+    :return: the log formatter for the log format, created once per log format
+    :rtype: Formatter
+    """
+    return Formatter(logformat)
+
+
 def set_up_logger(config: Config):
     """
     Sets up the encab logger
@@ -118,13 +154,16 @@ def set_up_logger(config: Config):
     :rtype: Logger
     """
 
+    global _log_handler
+
     if config.encab:
         root_logger = getLogger()
 
-        handler = StreamHandler()
-        formatter = Formatter(config.encab.logformat)
+        if _log_handler is None:
+            _log_handler = StreamHandler()
 
-        handler.setFormatter(formatter)
+        handler = _log_handler
+        handler.setFormatter(_formatter(config.encab.logformat))
 
         loglevel = config.encab.loglevel
         assert isinstance(loglevel, int) or isinstance(loglevel, str)
@@ -132,9 +171,8 @@ def set_up_logger(config: Config):
         root_logger.setLevel(loglevel)
         root_logger.addHandler(handler)
 
-    logger = getLogger(ENCAB)
-    extensions.update_logger(ENCAB, logger)
-    return logger
+    extensions.update_logger(ENCAB, mylogger)
+    return mylogger
 
 
 def set_up_extensions(config: Config, logger, extra: Dict[str, str]):
@@ -142,6 +180,7 @@ def set_up_extensions(config: Config, logger, extra: Dict[str, str]):
     sets up and configures the extensions.
     In case of dry run, `encab.extensions.Extensions.validate_extension` instead of
     `encab.extensions.Extensions.configure_extension` is run for each plugin.
+    Extension modules of disabled extensions are not loaded unless in dry run.
 
     :param config: the encab config
     :type config: Config
@@ -156,11 +195,12 @@ def set_up_extensions(config: Config, logger, extra: Dict[str, str]):
         dry_run = config.encab.dry_run
 
         for name, econf in config.extensions.items():
-            if econf.module:
-                extensions.register_module(econf.module)
-
             assert isinstance(econf.enabled, bool)
 
+            # modules of disabled extensions are only loaded to validate them
+            if econf.module and (econf.enabled or dry_run):
+                extensions.register_module(econf.module)
+
             if dry_run:
                 extensions.validate_extension(name, econf.enabled, econf.settings or {})
             else:
@@ -169,6 +209,64 @@ def set_up_extensions(config: Config, logger, extra: Dict[str, str]):
                 )
 
 
+builtin_extensions: Tuple[Any, ...] = ()
+"""the built-in extensions registered by the last call of :func:`encab`"""
+
+
+def register_builtin_extensions():
+    """
+    registers new instances of the built-in extensions.
+
+    The extensions keep the state of a run, so the instances of
+    the previous run, if any, are replaced instead of added to.
+    """
+    global builtin_extensions
+
+    extensions.unregister(builtin_extensions)
+    builtin_extensions = (
+        StarupScriptExtension(),
+        LogSanitizerExtension(),
+        ValidationExtension(),
+        LogCollectorExtension(),
+    )
+    extensions.register(builtin_extensions)
+
+
+SIGNAL_NAMES: Dict[int, str] = {SIGINT: "SIGINT", SIGTERM: "SIGTERM"}
+"""names of the signals handled by :func:`on_signal`"""
+
+signal_context = SimpleNamespace(programs=None, logger=None, extra=None)
+"""the programs, logger and log extra used by :func:`on_signal`"""
+
+
+def on_signal(signum: int, _):
+    """
+    Handles SIGINT and SIGTERM by interrupting or terminating the programs
+    set in :data:`signal_context` and exiting.
+
+    :param signum: the signal number
+    :type signum: int
+    """
+    programs = signal_context.programs
+    logger = signal_context.logger
+    extra = signal_context.extra
+
+    logger.info(
+        "Received %s. Interrupting/terminating programs...",
+        SIGNAL_NAMES[signum],
+        extra=extra,
+    )
+
+    if signum == SIGINT:
+        programs.interrupt()
+        logger.info("Programs interrupted. Exiting.", extra=extra)
+        sys.exit(EX_INTERRUPTED)
+    else:
+        programs.terminate()
+        logger.info("Programs terminated. Exiting.", extra=extra)
+        sys.exit(EX_TERMINATED)
+
+
 def encab(
     encab_stream: Optional[io.TextIOBase] = None, args: Optional[List[str]] = None
 ):
@@ -185,14 +283,7 @@ def encab(
     :type args: Optional[List[str]], optional
     """
 
-    extensions.register(
-        [
-            StarupScriptExtension(),
-            LogSanitizerExtension(),
-            ValidationExtension(),
-            LogCollectorExtension(),
-        ]
-    )
+    register_builtin_extensions()
 
     logger = None
     try:
@@ -205,11 +296,12 @@ def encab(
         logger.info("encab 0.1.7", extra=extra)
         logger.info("Using configuration %s", location, extra=extra)
 
-        logger.debug(
-            "Encab config: %s",
-            shorten(str(config), width=127, placeholder="..."),
-            extra=extra,
-        )
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(
+                "Encab config: %s",
+                shorten(str(config), width=127, placeholder="..."),
+                extra=extra,
+            )
 
         assert config.encab and isinstance(config.encab.dry_run, bool)
         dry_run = config.encab.dry_run
@@ -249,29 +341,12 @@ def encab(
 
         programs = Programs(program_config, context, args, config.encab)
 
-        def on_signal(signal, _):
-            signames = {SIGINT: "SIGINT", SIGTERM: "SIGTERM"}
-
-            logger.info(
-                "Received %s. Interrupting/terminating programs...",
-                signames[signal],
-                extra=extra,
-            )
-
-            if signal == SIGINT:
-                programs.interrupt()
-                logger.info("Programs interrupted. Exiting.", extra=extra)
-                exit(EX_INTERRUPTED)
-            else:
-                programs.terminate()
-                logger.info("Programs terminated. Exiting.", extra=extra)
-                exit(EX_TERMINATED)
-
-        sigint_handler = getsignal(SIGINT)
-        sigterm_handler = getsignal(SIGTERM)
+        signal_context.programs = programs
+        signal_context.logger = logger
+        signal_context.extra = extra
 
-        signal(SIGINT, on_signal)
-        signal(SIGTERM, on_signal)
+        sigint_handler = signal(SIGINT, on_signal)
+        sigterm_handler = signal(SIGTERM, on_signal)
 
         programs.run()
 
@@ -283,22 +358,23 @@ def encab(
         else:
             logger.debug("Programs ended. Exiting.", extra=extra)
 
-        exit(programs.exit_code if programs.exit_code is not None else EX_UNKNOWN_RC)
+        exit_code = programs.exit_code
+        sys.exit(exit_code if exit_code is not None else EX_UNKNOWN_RC)
     except PermissionError as e:
         print(
             f"Failed to set the encab user: {str(e)}."
             " \nTo set the user, you have to run encab as root."
         )
-        exit(EX_INSUFFICIENT_PERMISSIONS)
+        sys.exit(EX_INSUFFICIENT_PERMISSIONS)
     except IOError as e:
         print(f"I/O Error: {str(e)}")
-        exit((EX_IOERROR))
+        sys.exit(EX_IOERROR)
     except ValueError as e:
         print(f"Error in configuration: {str(e)}")
-        exit(EX_CONFIG_ERROR)
+        sys.exit(EX_CONFIG_ERROR)
     except KeyboardInterrupt:
         print("Encab was interrupted.")
-        exit(EX_OK)
+        sys.exit(EX_OK)
 
 
 if __name__ == "__main__":
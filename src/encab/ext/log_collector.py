@@ -1,20 +1,25 @@
 import yaml
 import marshmallow_dataclass
 
-from typing import Dict, List, Any, Optional, Union
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
 from logging import Logger, getLogger, INFO, getLevelName
 from pluggy import HookimplMarker  # type: ignore
 
 from dataclasses import dataclass
+from marshmallow import Schema
 from marshmallow.exceptions import MarshmallowError, ValidationError
-from io import TextIOBase
+from io import FileIO
 
 import re
 from datetime import datetime
+from functools import lru_cache
 
 import os
 import stat
 from threading import Thread, Event
+from time import monotonic
+
+from encab.common.log_stream import BUFFER_SIZE, ENCODING, log_lines
 
 ENCAB = "encab"
 LOG_COLLECTOR = "log_collector"
@@ -129,8 +134,7 @@ class LogCollectorSettings(object):
     @staticmethod
     def load(settings: Dict[str, Any]) -> "LogCollectorSettings":
         try:
-            ConfigSchema = marshmallow_dataclass.class_schema(LogCollectorSettings)
-            return ConfigSchema().load(settings)  # type: ignore
+            return _settings_schema().load(settings)  # type: ignore
         except ValidationError as e:
             msg = e.args[0]
             if isinstance(msg, dict):
@@ -141,24 +145,34 @@ class LogCollectorSettings(object):
             raise ConfigError(e.args)
 
 
+@lru_cache(maxsize=1)
+def _settings_schema() -> Schema:
+    """
+    :return: the schema for :class:`LogCollectorSettings`, created on first use
+    :rtype: Schema
+    """
+    return marshmallow_dataclass.class_schema(LogCollectorSettings)()
+
+
 class PathPattern(object):
     FORMAT = re.compile(r"((%%|[^%])*)|(%\([^\)]*\)[ed])")
 
     def __init__(self, pattern: str) -> None:
-        self.tokens = self.FORMAT.findall(pattern)
-
-    def replace(self, pattern: str, time: datetime, environment: Dict[str, str]) -> str:
-        suffix = pattern[-1]
-        pattern = pattern[2:-2]
-
-        if suffix == "e":
-            name = pattern
-            if name not in environment:
-                return ""
+        # literals are unmasked and specs are split up front, so format does no regex work
+        self.parts: List[Tuple[str, str]] = list()
+        for token in self.FORMAT.findall(pattern):
+            if token[0]:
+                self.parts.append(("", token[0].replace("%%", "%")))
+            elif token[2]:
+                self.parts.append((token[2][-1], token[2][2:-2]))
 
-            return environment[name]
+    def replace(
+        self, kind: str, name: str, time: datetime, environment: Dict[str, str]
+    ) -> str:
+        if kind == "e":
+            return environment.get(name, "")
         else:
-            date_format = pattern
+            date_format = name
             try:
                 return time.strftime(date_format)
             except ValueError as e:
@@ -168,23 +182,37 @@ class PathPattern(object):
 
     def format(self, time: datetime, environment: Dict[str, str]) -> str:
         result = list()
-        for token in self.tokens:
-            if token[0]:
-                result.append(token[0].replace("%%", "%"))
-            elif token[2]:
-                result.append(self.replace(token[2], time, environment))
+        for kind, value in self.parts:
+            if kind:
+                result.append(self.replace(kind, value, time, environment))
+            else:
+                result.append(value)
 
         return "".join(result)
 
 
+@lru_cache(maxsize=128)
+def _compile_pattern(pattern: str) -> PathPattern:
+    """
+    :return: the path pattern for the pattern string, created once per pattern string
+    :rtype: PathPattern
+    """
+    return PathPattern(pattern)
+
+
 class LogPath(object):
     def __init__(
         self, path_or_pattern: str, environment: Dict[str, str], fixed: bool
     ) -> None:
         self._fixed_path = path_or_pattern if fixed else None
-        self._path_pattern = None if fixed else PathPattern(path_or_pattern)
+        self._path_pattern = None if fixed else _compile_pattern(path_or_pattern)
         self._environment = environment
 
+        # chosen once, so polling a fixed path doesn't check for a pattern each time
+        self.current: Callable[[Optional[datetime]], str] = (
+            self._current_fixed if fixed else self._current_variable
+        )
+
     @staticmethod
     def fixed(path: str) -> "LogPath":
         return LogPath(path, dict(), True)
@@ -193,13 +221,14 @@ class LogPath(object):
     def variable(path_pattern: str, environment: Dict[str, str]) -> "LogPath":
         return LogPath(path_pattern, environment, False)
 
-    def current(self, time: datetime):
-        if self._fixed_path:
-            return self._fixed_path
-        else:
-            time = time or datetime.now()
-            assert self._path_pattern
-            return self._path_pattern.format(time, self._environment)
+    def _current_fixed(self, time: Optional[datetime]) -> str:
+        assert self._fixed_path is not None
+        return self._fixed_path
+
+    def _current_variable(self, time: Optional[datetime]) -> str:
+        time = time or datetime.now()
+        assert self._path_pattern
+        return self._path_pattern.format(time, self._environment)
 
     def is_fixed(self):
         return self._fixed_path is not None
@@ -232,7 +261,9 @@ class LogCollector(object):
         self._stop = Event()
         self._stopped = Event()
         self._current_time: Optional[datetime] = None
-        self._fp: Optional[TextIOBase] = None
+        self._fp: Optional[FileIO] = None
+        self._tail = b""
+        self._next_poll = 0.0
         self._file_existed_at_start = False
 
     def __now(self) -> datetime:
@@ -241,22 +272,20 @@ class LogCollector(object):
     def current_path(self) -> str:
         return self.path.current(self.__now())
 
-    def __st_mode(self) -> int:
-        return os.stat(self.current_path()).st_mode
-
-    def file_exists(self):
+    def file_mode(self) -> Optional[int]:
+        """
+        :return: the mode of the current file or None if it is neither a regular file nor a FIFO
+        :rtype: Optional[int]
+        """
         try:
-            st_mode = self.__st_mode()
-            return stat.S_ISREG(st_mode) or stat.S_ISFIFO(st_mode)
+            st_mode = os.stat(self.current_path()).st_mode
         except FileNotFoundError:
-            return False
+            return None
 
-    def is_regular_file(self):
-        try:
-            st_mode = self.__st_mode()
-            return stat.S_ISREG(st_mode)
-        except FileNotFoundError:
-            return False
+        return st_mode if stat.S_ISREG(st_mode) or stat.S_ISFIFO(st_mode) else None
+
+    def file_exists(self):
+        return self.file_mode() is not None
 
     def check_stopped(self):
         if self._stop.is_set():
@@ -271,14 +300,62 @@ class LogCollector(object):
     def clear_fp(self):
         self._fp = None
 
+    def log_batch(self, lines: List[bytes]):
+        if self.logger.isEnabledFor(self.level):
+            texts = (line.decode(ENCODING, "replace") for line in lines)
+            log_lines(self.logger, self.level, texts, self.extra, __file__, "log_batch")
+
     def log_lines(self):
-        for line in self.get_fp():
-            line = line.rstrip("\r\n\t ")
-            self.logger.log(self.level, line, extra=self.extra)
+        """
+        Logs the lines written since the last call.
+        The file is read in large chunks, an incomplete last line is kept
+        until it is completed or no new data arrived since the last call.
+        """
+        chunk = self.read_chunk()
+
+        if not chunk:
+            self.flush_tail()
+            return
+
+        while chunk:
+            lines = (self._tail + chunk).split(b"\n")
+            self._tail = lines.pop()
+            self.log_batch(lines)
+            chunk = self.read_chunk()
+
+    def read_chunk(self) -> bytes:
+        """
+        Reads up to :data:`encab.common.log_stream.BUFFER_SIZE` bytes.
+        The file is read through the file object on each call,
+        since :meth:`request_stop` may close it from another thread.
+
+        :raises Stopped: if the file was closed to stop the collector
+        :return: the bytes read, empty at the end of the file
+        :rtype: bytes
+        """
+        fp = self.get_fp()
+        try:
+            return fp.read(BUFFER_SIZE) or b""
+        except ValueError:
+            raise Stopped()  # the file was closed
+        except OSError:
+            if self._stop.is_set():
+                raise Stopped()
+            raise
+
+    def flush_tail(self):
+        """
+        Logs the incomplete last line, if any.
+        """
+        if self._tail:
+            self.log_batch([self._tail])
+            self._tail = b""
 
-    def open(self, path: str) -> TextIOBase:
-        fp = open(path, "r")
+    def open(self, path: str) -> FileIO:
+        fp = open(path, "rb", buffering=0)
         self._fp = fp
+        self._tail = b""
+        self._next_poll = monotonic() + self.poll_interval
         return fp
 
     def fast_forward(self):
@@ -294,20 +371,28 @@ class LogCollector(object):
             fp.seek(pos)
 
     def poll_data(self, path: str):
-        fp = self.get_fp()
-        pos = fp.tell()
         self.logger.debug(
-            f"Waiting for new data in file {path}...",
+            "Waiting for new data in file %s...",
+            path,
             extra=self.extra,
         )
-        self._stop.wait(self.poll_interval)
+
+        # the polls keep their cadence no matter how long logging the lines took
+        now = monotonic()
+        remaining = self._next_poll - now
+        if remaining > 0:
+            self._stop.wait(remaining)
+            self._next_poll += self.poll_interval
+        else:
+            self._next_poll = now + self.poll_interval
+
         self.check_stopped()
-        fp.seek(pos)
 
     def collect_fifo(self):
         path = self.current_path()
         with self.open(path):
             self.log_lines()
+            self.flush_tail()
 
     def collect_file(self):
         path = self.current_path()
@@ -341,12 +426,23 @@ class LogCollector(object):
                     self.check_stopped()
 
                     if not self.same_log_file(path):
+                        self.flush_tail()
                         break
 
                     self.poll_data(path)
 
-    def poll_file(self):
-        while not self.file_exists():
+    def poll_file(self) -> int:
+        """
+        Waits until the current file exists.
+
+        :return: the mode of the file
+        :rtype: int
+        """
+        while True:
+            st_mode = self.file_mode()
+            if st_mode is not None:
+                return st_mode
+
             self.check_stopped()
             self.logger.debug(
                 "Waiting for file %s ...", self.current_path(), extra=self.extra
@@ -361,18 +457,15 @@ class LogCollector(object):
             while True:
                 try:
                     self.clear_fp()
-                    self.poll_file()
+                    st_mode = self.poll_file()
                     self.check_stopped()
-                    if not self.file_exists():
-                        raise Stopped()
 
-                    if not self.is_regular_file():
+                    if stat.S_ISFIFO(st_mode):
                         self.collect_fifo()
+                    elif self.path.is_fixed():
+                        self.collect_file()
                     else:
-                        if self.path.is_fixed():
-                            self.collect_file()
-                        else:
-                            self.collect_rolling_files()
+                        self.collect_rolling_files()
 
                 except FileNotFoundError:
                     pass
@@ -401,7 +494,10 @@ class LogCollector(object):
     def set_current_time(self, current_time: datetime):
         self._current_time = current_time
 
-    def stop(self, wait_time: float = 1.0):
+    def request_stop(self):
+        """
+        Tells the collector to stop without waiting for it.
+        """
         self._stop.set()
         if self._fp:
             try:
@@ -409,7 +505,21 @@ class LogCollector(object):
             except IOError:
                 pass
             self._fp = None
-        self._stopped.wait(wait_time)
+
+    def wait_stopped(self, wait_time: float = 1.0) -> bool:
+        """
+        Waits for the collector to stop.
+
+        :param wait_time: the maximum time to wait in seconds, defaults to 1.0
+        :type wait_time: float, optional
+        :return: True if the collector has stopped
+        :rtype: bool
+        """
+        return self._stopped.wait(wait_time)
+
+    def stop(self, wait_time: float = 1.0):
+        self.request_stop()
+        self.wait_stopped(wait_time)
 
 
 extension_impl = HookimplMarker(ENCAB)
@@ -449,9 +559,14 @@ class LogCollectorExtension(object):
         for collector in self.collectors:
             collector.start()
 
-    def stop_collectors(self):
+    def stop_collectors(self, wait_time: float = 1.0):
+        # all collectors stop concurrently, so shutdown takes at most wait_time
+        for collector in self.collectors:
+            collector.request_stop()
+
+        deadline = monotonic() + wait_time
         for collector in self.collectors:
-            collector.stop()
+            collector.wait_stopped(max(deadline - monotonic(), 0))
 
     @extension_impl
     def validate_extension(self, name: str, enabled: bool, settings: Dict[str, Any]):
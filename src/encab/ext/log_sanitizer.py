@@ -1,12 +1,16 @@
 import yaml
 import marshmallow_dataclass
 
-from fnmatch import fnmatch
-from typing import Dict, Set, List, Any, Tuple, Optional
+import re
+
+from fnmatch import translate
+from functools import lru_cache
+from typing import Dict, Set, FrozenSet, List, Any, Tuple, Optional, Match, Pattern
 from logging import Logger, Filter, getLogger
 from pluggy import HookimplMarker  # type: ignore
 
 from dataclasses import dataclass
+from marshmallow import Schema
 from marshmallow.exceptions import MarshmallowError, ValidationError
 
 ENCAB = "encab"
@@ -62,8 +66,7 @@ class LogSanitizerSettings(object):
     @staticmethod
     def load(settings: Dict[str, Any]) -> "LogSanitizerSettings":
         try:
-            ConfigSchema = marshmallow_dataclass.class_schema(LogSanitizerSettings)
-            return ConfigSchema().load(settings)  # type: ignore
+            return _settings_schema().load(settings)  # type: ignore
         except ValidationError as e:
             msg = e.args[0]
             if isinstance(msg, dict):
@@ -74,23 +77,61 @@ class LogSanitizerSettings(object):
             raise ConfigError(e.args)
 
 
+@lru_cache(maxsize=1)
+def _settings_schema() -> Schema:
+    """
+    :return: the schema for :class:`LogSanitizerSettings`, created on first use
+    :rtype: Schema
+    """
+    return marshmallow_dataclass.class_schema(LogSanitizerSettings)()
+
+
+def _mask(match: Match) -> str:
+    return "*" * (match.end() - match.start())
+
+
 class SanitizingFilter(Filter):
     def __init__(self, sensitive_strings: Set[str]) -> None:
         super().__init__()
+        self._pattern: Optional[Pattern] = None
+        self._numbers: FrozenSet[str] = frozenset()
+        self.set_secrets(sensitive_strings)
+
+    def set_secrets(self, sensitive_strings: Set[str]):
+        """
+        Sets the strings to be masked.
+        Records pass unchanged as long as there is nothing to mask.
+
+        :param sensitive_strings: the strings to be masked
+        :type sensitive_strings: Set[str]
+        """
         self.sensitive_strings = sensitive_strings
+        # longer secrets first, so a secret containing another one is masked entirely
+        secrets = sorted(filter(None, sensitive_strings), key=len, reverse=True)
+        self._numbers = frozenset(secrets)
+        self._pattern = (
+            re.compile("|".join(map(re.escape, secrets)), re.DOTALL)
+            if secrets
+            else None
+        )
 
     def sanitize(self, value: Any) -> Any:
-        for s in self.sensitive_strings:
-            if isinstance(value, int) or isinstance(value, float):
-                value = -1 if s == str(value) else value
-            else:
-                value = str(value).replace(s, "*" * len(s))
-        return value
+        pattern = self._pattern
+        if pattern is None:
+            return value
+
+        if isinstance(value, int) or isinstance(value, float):
+            return -1 if str(value) in self._numbers else value
+
+        return pattern.sub(_mask, str(value))
 
     def sanitize_all(self, args: Tuple[Any]):
         return tuple([self.sanitize(arg) for arg in args])
 
     def filter(self, record):
+        if self._pattern is None:
+            return True
+
         record.msg = self.sanitize(record.msg)
         assert isinstance(record.args, tuple)
         record.args = self.sanitize_all(record.args)
@@ -134,8 +175,25 @@ class LogSanitizerExtension(object):
 
     def __init__(self) -> None:
         self.sensitive_strings: Set[str] = set()
+        self.filter = SanitizingFilter(self.sensitive_strings)
         self.settings = LogSanitizerSettings(patterns=self.PATTERNS, override=False)
         self.enabled = True
+        self._sensitive_re = self.compile_patterns(self.PATTERNS)
+
+    @staticmethod
+    def compile_patterns(patterns: List[str]) -> Optional[Pattern]:
+        """
+        Combines the name patterns into one regular expression for upper case names
+
+        :param patterns: UNIX file patterns
+        :type patterns: List[str]
+        :return: the regular expression or None if there are no patterns
+        :rtype: Optional[Pattern]
+        """
+        if not patterns:
+            return None
+
+        return re.compile("|".join(translate(pattern.upper()) for pattern in patterns))
 
     @extension_impl
     def validate_extension(self, name: str, enabled: bool, settings: Dict[str, Any]):
@@ -159,23 +217,27 @@ class LogSanitizerExtension(object):
             patterns = self.settings.patterns
             self.settings.patterns = [*patterns, *self.PATTERNS]
 
-    def is_sensitive(self, name: str) -> bool:
         assert isinstance(self.settings.patterns, list)
-        patterns = self.settings.patterns
-        for pattern in patterns:
-            if fnmatch(name.upper(), pattern.upper()):
-                return True
-        return False
+        self._sensitive_re = self.compile_patterns(self.settings.patterns)
+
+    def is_sensitive(self, name: str) -> bool:
+        sensitive_re = self._sensitive_re
+        return sensitive_re is not None and sensitive_re.match(name.upper()) is not None
 
     @extension_impl
     def extend_environment(self, program_name: str, environment: Dict[str, str]):
         if not self.enabled:
             return
 
+        size = len(self.sensitive_strings)
         for name, value in environment.items():
-            if self.is_sensitive(name):
+            # blank values would mask every space in the log, not a secret
+            if value.strip() and self.is_sensitive(name):
                 self.sensitive_strings.add(value)
 
+        if len(self.sensitive_strings) != size:
+            self.filter.set_secrets(self.sensitive_strings)
+
     @extension_impl
     def update_logger(self, program_name: str, logger: Logger):
         if program_name == ENCAB:
@@ -194,4 +256,5 @@ class LogSanitizerExtension(object):
         if not self.enabled:
             return
 
-        logger.addFilter(SanitizingFilter(self.sensitive_strings))
+        # one filter instance shared by all loggers
+        logger.addFilter(self.filter)
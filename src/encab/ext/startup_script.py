@@ -1,21 +1,24 @@
 import os
-import sys
-import re
 import yaml
 import marshmallow_dataclass
 
 from io import StringIO
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Union
 from logging import getLogger
 from pluggy import HookimplMarker  # type: ignore
 
 from dataclasses import dataclass
+from marshmallow import Schema
 from marshmallow.exceptions import MarshmallowError, ValidationError
 
 from dotenv import dotenv_values
-from subprocess import Popen
+from subprocess import Popen, PIPE
+from threading import Lock
 
 from encab.common.process import Process
+from encab.config import ENV_NAME_PATTERN
+from encab.common.log_stream import ENCODING
 
 ENCAB = "encab"
 STARTUP_SCRIPT = "startup_script"
@@ -97,8 +100,7 @@ class StartupScriptSettings(object):
     @staticmethod
     def load(settings: Dict[str, Any]) -> "StartupScriptSettings":
         try:
-            ConfigSchema = marshmallow_dataclass.class_schema(StartupScriptSettings)
-            return ConfigSchema().load(settings)  # type: ignore
+            return _settings_schema().load(settings)  # type: ignore
         except ValidationError as e:
             msg = e.args[0]  # type: ignore
             if isinstance(msg, dict):
@@ -109,6 +111,15 @@ class StartupScriptSettings(object):
             raise ConfigError(e.args)
 
 
+@lru_cache(maxsize=1)
+def _settings_schema() -> Schema:
+    """
+    :return: the schema for :class:`StartupScriptSettings`, created on first use
+    :rtype: Schema
+    """
+    return marshmallow_dataclass.class_schema(StartupScriptSettings)()
+
+
 class StartupScript:
     """
     Run scripts before the actual programs are started.
@@ -119,6 +130,7 @@ class StartupScript:
     def __init__(self) -> None:
         self.settings: Optional[StartupScriptSettings] = None
         self.executed = False
+        self._lock = Lock()
 
     def update_settings(self, settings: StartupScriptSettings):
         self.settings = settings
@@ -197,10 +209,9 @@ class StartupScript:
         :rtype: Dict[str, str]
         """
         env = dict()
-        pattern = re.compile(r"^[a-zA-Z_]+[a-zA-Z0-9_]*")
         for k, v in values.items():  # type: ignore
             name = str(k)
-            if not pattern.match(name):
+            if not ENV_NAME_PATTERN.fullmatch(name):
                 raise ConfigError(
                     f"{STARTUP_SCRIPT}: Expected valid environment variable name (see POSIX 3.231 Name)"
                     f" but was '{name}'."
@@ -262,23 +273,20 @@ class StartupScript:
 
         mylogger.info("Running buildenv script", extra={"program": ENCAB})
 
-        lines: List[str] = list()
+        outputs: List[str] = list()
         try:
 
-            def read_lines(process: Popen):
-                assert process.stdout
-                with process.stdout as stdout:
-                    for line in stdout:
-                        strline = line.decode(sys.getdefaultencoding()).rstrip(
-                            "\r\n\t "
-                        )
-                        lines.append(strline)
+            def communicate(process: Popen):
+                # the output is small, so it is collected without extra reader threads
+                stdout, stderr = process.communicate()
+                outputs.append(stdout.decode(ENCODING))
+
+                for line in stderr.decode(ENCODING, "replace").splitlines():
+                    mylogger.error(line.rstrip("\t "), extra=extra)
 
             process = Process(script, environment, shell=True)
 
-            exit_code = process.execute_and_log(
-                read_lines, mylogger, extra, log_stdout=False
-            )
+            exit_code = process.execute(communicate, mylogger, extra, None, PIPE, PIPE)
 
             if exit_code != 0:
                 raise IOError(f"Buildenv script failed with exit code: {exit_code}")
@@ -286,17 +294,29 @@ class StartupScript:
         except BaseException as e:
             raise IOError(f"{STARTUP_SCRIPT}: Failed to execute buildenv script: {e}")
 
-        self.update_env(environment, stream=StringIO("\n".join(lines)))
+        self.update_env(environment, stream=StringIO("".join(outputs)))
 
     def execute(self, environment: Dict[str, str]):
+        """
+        runs the startup script once. Calls made during the run wait until it has ended,
+        later calls return immediately. A failed script is not run again.
+
+        :param environment: the environment
+        :type environment: Dict[str, str]
+        """
         if self.executed:
             return
 
-        self.executed = True
+        with self._lock:
+            if self.executed:
+                return
 
-        self.loadenv(environment)
-        self.buildenv(environment)
-        self.sh(environment)
+            try:
+                self.loadenv(environment)
+                self.buildenv(environment)
+                self.sh(environment)
+            finally:
+                self.executed = True
 
 
 extension_impl = HookimplMarker(ENCAB)
@@ -5,12 +5,14 @@ import marshmallow_dataclass
 from re import match, compile
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Dict, Set, List, Any, Optional, Union
 from logging import getLogger
 from pluggy import HookimplMarker  # type: ignore
 
 from yaml.error import YAMLError
 from dataclasses import dataclass
+from marshmallow import Schema
 from marshmallow.exceptions import MarshmallowError, ValidationError
 
 ENCAB = "encab"
@@ -193,8 +195,7 @@ class ValidationSettings(object):
     @staticmethod
     def load(settings: Dict[str, Any]) -> "ValidationSettings":
         try:
-            ConfigSchema = marshmallow_dataclass.class_schema(ValidationSettings)
-            return ConfigSchema().load(settings)  # type: ignore
+            return _settings_schema().load(settings)  # type: ignore
         except ValidationError as e:
             msg = e.args[0]
             if isinstance(msg, dict):
@@ -230,8 +231,7 @@ class ValidationSettings(object):
                 if not isinstance(var, str):
                     raise ConfigError(f"{prefix}: Invalid variable name {var}")
 
-                ConfigSchema = marshmallow_dataclass.class_schema(Validation)
-                validation = ConfigSchema().load(validation_map)
+                validation = _validation_schema().load(validation_map)
                 assert isinstance(validation, Validation)
                 validations[var] = validation
 
@@ -248,6 +248,24 @@ class ValidationSettings(object):
             raise ConfigError(f"{prefix}:" + str(e.args[0]), e.args[1:])
 
 
+@lru_cache(maxsize=1)
+def _validation_schema() -> Schema:
+    """
+    :return: the schema for :class:`Validation`, created on first use
+    :rtype: Schema
+    """
+    return marshmallow_dataclass.class_schema(Validation)()
+
+
+@lru_cache(maxsize=1)
+def _settings_schema() -> Schema:
+    """
+    :return: the schema for :class:`ValidationSettings`, created on first use
+    :rtype: Schema
+    """
+    return marshmallow_dataclass.class_schema(ValidationSettings)()
+
+
 extension_impl = HookimplMarker(ENCAB)
 
 
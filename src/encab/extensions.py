@@ -1,5 +1,5 @@
 from logging import Logger
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 from importlib import import_module
 from pluggy import HookspecMarker, PluginManager, PluginValidationError  # type: ignore
 
@@ -137,16 +137,26 @@ class Extensions(object):
         """
         self.hook.programs_ended()
 
-    def register(self, extensions: List[Any]) -> None:
+    def register(self, extensions: Sequence[Any]) -> None:
         """
         register new extension as object or module
 
         :param extensions: a list of extension objects and/or modules
-        :type extensions: List[Any]
+        :type extensions: Sequence[Any]
         """
         for extension in extensions:
             self.plugin_manager.register(extension)
 
+    def unregister(self, extensions: Sequence[Any]) -> None:
+        """
+        unregisters extensions registered before
+
+        :param extensions: a list of extension objects and/or modules
+        :type extensions: Sequence[Any]
+        """
+        for extension in extensions:
+            self.plugin_manager.unregister(extension)
+
     def register_module(self, module_name: str):
         try:
             module = import_module(module_name)
@@ -1,5 +1,3 @@
-from copy import deepcopy
-
 from typing import Dict, Optional, Union, List
 
 from subprocess import Popen
@@ -33,7 +31,7 @@ class ExecutionContext(object):
         extensions.extend_environment(observer.get_name(), environment)
 
     def extend(self, environment: Dict[str, str]) -> "ExecutionContext":
-        env = deepcopy(self.environment)
+        env = dict(self.environment)
         if environment:
             env.update(environment)
             extensions.extend_environment(self.observer.get_name(), self.environment)
@@ -47,7 +45,7 @@ class ExecutionContext(object):
         logger: Logger,
         extra: Dict[str, str],
     ) -> "ExecutionContext":
-        env = deepcopy(self.environment)
+        env = dict(self.environment)
         observer = self.observer.spawn(name, logger, extra)
 
         if environment:
@@ -126,10 +124,10 @@ class Program(object):
         assert isinstance(reap_zombies, bool)
 
         try:
-            assert isinstance(startup_delay, float) or isinstance(startup_delay, int)
+            assert isinstance(startup_delay, float)
             assert isinstance(umask, int)
 
-            state.wait(float(startup_delay))
+            state.wait(startup_delay)
 
             observer.on_execution(command, env, self.config)
             state.set(ProgramState.STARTING)
@@ -162,7 +160,7 @@ class Program(object):
 
                 if restart_delay is not None:
                     state.set(ProgramState.STARTING)
-                    state.wait(float(restart_delay))
+                    state.wait(restart_delay)
                 else:
                     break
 
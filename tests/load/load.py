@@ -1,13 +1,19 @@
 import time
 import psutil
-import humanize
 from datetime import datetime
 
-psutil.cpu_percent
+
+def naturalsize(size: float) -> str:
+    for unit in ("Bytes", "kB", "MB", "GB"):
+        if size < 1000 or unit == "GB":
+            break
+        size /= 1000
+    return f"{size:.1f} {unit}"
+
 
 while True:
     t = datetime.now()
     cpu = psutil.cpu_percent(interval=0)
-    used = humanize.naturalsize(psutil.virtual_memory().used)
+    used = naturalsize(psutil.virtual_memory().used)
     print(f"{t}: CPU load {cpu} %, memory used: {used}", flush=True)
     time.sleep(0.01)
@@ -1,7 +1,7 @@
 import io
 import unittest
 
-from encab.config import Config, ProgramConfig, EncabConfig
+from encab.config import Config, ConfigError, ProgramConfig, EncabConfig
 from logging import DEBUG
 
 
@@ -43,3 +43,11 @@ class ConfigTest(unittest.TestCase):
         programs = c.programs or {}
         self.assertEqual(["cron", "-f"], programs["cron"].command)
         self.assertEqual(["httpd-foreground"], programs["main"].command)
+
+    def test_environment_names(self):
+        config = ProgramConfig.create(command="x", environment={"_X1": "1", "Y": "2"})
+        self.assertEqual({"_X1": "1", "Y": "2"}, config.environment)
+
+        for name in ["1X", "X-Y", "X$Y", "X "]:
+            with self.assertRaises(ConfigError):
+                ProgramConfig.create(command="x", environment={name: "1"})
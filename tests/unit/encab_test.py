@@ -1,8 +1,10 @@
 import io
+import os
 import unittest
 
+from tempfile import TemporaryDirectory
 
-from encab.encab import encab, load_config
+from encab.encab import encab, load_config, find_config_file
 
 
 class EncabTest(unittest.TestCase):
@@ -38,3 +40,16 @@ class EncabTest(unittest.TestCase):
         """
 
         encab(encab_stream=io.StringIO(config))
+
+    def test_find_config_file(self):
+        cwd = os.getcwd()
+        with TemporaryDirectory() as directory:
+            try:
+                os.chdir(directory)
+                for name in ["encab.yaml", "encab.yml"]:
+                    with open(name, "w"):
+                        pass
+
+                self.assertEqual("./encab.yml", find_config_file())
+            finally:
+                os.chdir(cwd)
@@ -1,7 +1,13 @@
 from typing import Dict, Optional, List
 from logging import Logger, DEBUG, INFO, Handler, LogRecord
 
-from encab.ext.log_collector import LogCollector, PathPattern, LogPath
+from encab.ext.log_collector import (
+    LogCollector,
+    LogCollectorExtension,
+    PathPattern,
+    LogPath,
+    Stopped,
+)
 
 import os
 import tempfile
@@ -52,6 +58,13 @@ class PathPathTest(unittest.TestCase):
     def test_replace_datetime(self):
         self.assert_match("error-20230201.log", "error-%(%Y%m%d)d.log")
 
+    def test_mixed_pattern(self):
+        self.assert_match(
+            "home/%/20230201-x.log",
+            "%(HOME)e/%%/%(%Y%m%d)d-%(MISSING)ex.log",
+            env={"HOME": "home"},
+        )
+
 
 class LogCollectorTest(unittest.TestCase):
     handler: TestLogHandler
@@ -113,6 +126,65 @@ class LogCollectorTest(unittest.TestCase):
 
         self.assertEqual([f"line {i}" for i in range(5)], self.recorded_messages())
 
+    def test_stop_collectors(self):
+        tmpdir = tempfile.mkdtemp()
+        extension = LogCollectorExtension()
+        extension.collectors = [
+            LogCollector(
+                f"test_source{i}",
+                LogPath.fixed(os.path.join(tmpdir, f"missing{i}")),
+                self.logger,
+                poll_interval=5,
+            )
+            for i in range(3)
+        ]
+        extension.start_collectors()
+
+        start = time.monotonic()
+        extension.stop_collectors()
+
+        self.assertLess(time.monotonic() - start, 1.0)
+        for collector in extension.collectors:
+            self.assertTrue(collector.wait_stopped(0))
+
+    def test_read_closed_file(self):
+        tmpdir = tempfile.mkdtemp()
+        path = os.path.join(tmpdir, "encabtestfile")
+        self.write_lines(path)
+
+        source = LogCollector("test_source", LogPath.fixed(path), self.logger)
+        fp = source.open(path)
+        fp.close()
+
+        with self.assertRaises(Stopped):
+            source.log_lines()
+        self.assertEqual([], self.recorded_messages())
+
+    def test_source_file_partial_line(self):
+        tmpdir = tempfile.mkdtemp()
+        path = os.path.join(tmpdir, "encabtestfile")
+
+        source = LogCollector(
+            "test_source", LogPath.fixed(path), self.logger, poll_interval=0.1
+        )
+        source.start()
+
+        with open(path, "wb") as fp:
+            fp.write(b"par")
+            fp.flush()
+            sleep(0.02)
+            fp.write("tial \u00e4\nlast".encode())
+            fp.flush()
+        time.sleep(0.4)
+
+        source.stop()
+
+        self.assertEqual(["partial \u00e4", "last"], self.recorded_messages())
+        self.assertEqual(
+            ["log_collector"],
+            list({rec.module for rec in self.handler.records if rec.levelno == INFO}),
+        )
+
     def test_source_file_variable_path(self):
         tmpdir = tempfile.mkdtemp()
         path = os.path.join(tmpdir, "encabtestfile-20230201.log")
@@ -40,6 +40,16 @@ class LogSanititerTest(unittest.TestCase):
     def test_sanitize_with_mixed_arguments(self):
         self.assertEqual("*bc*b-1", self.sanitize({"a", "123"}, "abc%s%d", "ab", 123))
 
+    def test_sanitize_overlapping(self):
+        self.assertEqual("****d", self.sanitize({"ab", "abcd", "bc"}, "abcdd"))
+
+    def test_sanitize_set_secrets(self):
+        filter = SanitizingFilter(set())
+        filter.set_secrets({"a", "b"})
+        record = LogRecord("", INFO, ".", 0, "abc", args=(), exc_info=None)
+        filter.filter(record)
+        self.assertEqual("**c", record.getMessage())
+
     def is_sensitive(self, name: str, patterns: Optional[List[str]] = None) -> bool:
         config = {"patterns": patterns} if patterns else {}
         ext = LogSanitizerExtension()
@@ -69,3 +79,15 @@ class LogSanititerTest(unittest.TestCase):
         self.assertEqual(
             {"abc"}, self.extend_environment({"XKEY": "abc", "XMAGIC": "123"})
         )
+
+    def test_extend_environment_blank_values(self):
+        self.assertEqual(
+            {"1"}, self.extend_environment({"XKEY": "", "YKEY": "  ", "ZKEY": "1"})
+        )
+
+    def test_extend_environment_updates_filter(self):
+        ext = LogSanitizerExtension()
+        ext.extend_environment("", {"XKEY": "abc"})
+        record = LogRecord("", INFO, ".", 0, "xabcx", args=(), exc_info=None)
+        ext.filter.filter(record)
+        self.assertEqual("x***x", record.getMessage())
@@ -1,6 +1,9 @@
 import os
+import time
 import unittest
 
+from threading import Thread
+
 from typing import Dict, Any
 
 from encab.ext.startup_script import StartupScript, StartupScriptSettings, ConfigError
@@ -24,6 +27,25 @@ class StartupScriptTest(unittest.TestCase):
         script.execute(env)
         self.assertEqual({"X": "1"}, env)
 
+    def test_buildenv_line_endings(self) -> None:
+        env: Dict[str, str] = dict()
+
+        script = self.script({"buildenv": "printf 'X=1 \\r\\n\\nY=2\\t'"})
+
+        script.execute(env)
+        self.assertEqual({"X": "1", "Y": "2"}, env)
+
+    def test_buildenv_stderr(self) -> None:
+        env: Dict[str, str] = dict()
+
+        script = self.script({"buildenv": 'echo "X=1"; echo "failure" >&2'})
+
+        with self.assertLogs("startup_script", "ERROR") as logs:
+            script.execute(env)
+
+        self.assertEqual({"X": "1"}, env)
+        self.assertEqual(["failure"], [rec.getMessage() for rec in logs.records])
+
     def test_invalid_variable_name(self) -> None:
         env: Dict[str, str] = dict()
 
@@ -35,6 +57,25 @@ class StartupScriptTest(unittest.TestCase):
         except ConfigError:
             pass
 
+    def test_invalid_variable_name_suffix(self) -> None:
+        script = self.script({})
+
+        with self.assertRaises(ConfigError):
+            script.clean_up_env({"X-Y": "1"})
+
+    def test_concurrent_execute(self) -> None:
+        env: Dict[str, str] = dict()
+
+        script = self.script({"buildenv": 'sleep 0.3; echo "X=1"'})
+
+        thread = Thread(target=script.execute, args=(env,))
+        thread.start()
+        time.sleep(0.05)
+
+        script.execute(env)
+        self.assertEqual({"X": "1"}, env)
+        thread.join()
+
     def test_loadenv(self) -> None:
         ext_path = os.path.dirname(__file__)
         dotenv_file = os.path.join(ext_path, "test.dotenv")
@@ -0,0 +1,174 @@
+import os
+import time
+import unittest
+
+from threading import Thread
+
+from typing import List, Tuple
+from logging import Logger, Handler, LogRecord, DEBUG, INFO, ERROR
+
+from encab.common.log_stream import (
+    LogStream,
+    LogMultiplexer,
+    BUFFER_SIZE,
+    PARTIAL_LINE_TIMEOUT,
+)
+
+
+class TestLogHandler(Handler):
+    def __init__(self, level: int = 0) -> None:
+        super().__init__(level)
+        self.records: List[LogRecord] = list()
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class LogStreamTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.handler = TestLogHandler()
+        self.logger = Logger("test", DEBUG)
+        self.logger.addHandler(self.handler)
+        self.extra = {"program": "test"}
+        self.multiplexer = LogMultiplexer("test")
+
+    def tearDown(self) -> None:
+        self.multiplexer.close()
+        super().tearDown()
+
+    def messages(self) -> List[Tuple[int, str]]:
+        return [(rec.levelno, rec.getMessage()) for rec in self.handler.records]
+
+    def pipe(self, data: bytes):
+        read_fd, write_fd = os.pipe()
+
+        def write():
+            with os.fdopen(write_fd, "wb") as fp:
+                fp.write(data)
+
+        Thread(target=write, daemon=True).start()
+        return os.fdopen(read_fd, "rb")
+
+    def test_log_lines(self):
+        stream = self.pipe(b"line 1\nline 2 \r\n\nlast")
+        LogStream(self.logger, INFO, stream, self.extra).start().wait_close()
+
+        self.assertEqual(
+            [(INFO, "line 1"), (INFO, "line 2"), (INFO, ""), (INFO, "last")],
+            self.messages(),
+        )
+        self.assertTrue(stream.closed)
+
+    def test_decode(self):
+        stream = self.pipe("ä\n".encode() + b"\xff\n")
+        LogStream(self.logger, INFO, stream, self.extra).start().wait_close()
+
+        self.assertEqual([(INFO, "ä"), (INFO, "�")], self.messages())
+
+    def test_long_line(self):
+        stream = self.pipe(b"x" * (BUFFER_SIZE + 1))
+        LogStream(self.logger, INFO, stream, self.extra).start().wait_close()
+
+        self.assertEqual(BUFFER_SIZE + 1, sum(len(m) for _, m in self.messages()))
+
+    def test_disabled_level(self):
+        self.logger.setLevel(INFO)
+        stream = self.pipe(b"debug 1\ndebug 2\n")
+        LogStream(self.logger, DEBUG, stream, self.extra).start().wait_close()
+
+        self.assertEqual([], self.messages())
+        self.assertTrue(stream.closed)
+
+    def test_multiplexer(self):
+        stdout = self.pipe(b"out 1\nout 2\n")
+        stderr = self.pipe(b"err 1\n")
+
+        streams = [
+            self.multiplexer.add(LogStream(self.logger, INFO, stdout, self.extra)),
+            self.multiplexer.add(LogStream(self.logger, ERROR, stderr, self.extra)),
+        ]
+
+        for stream in streams:
+            stream.wait_close()
+
+        self.assertEqual(
+            [(INFO, "out 1"), (INFO, "out 2"), (ERROR, "err 1")],
+            sorted(self.messages()),
+        )
+        self.assertTrue(stdout.closed)
+        self.assertTrue(stderr.closed)
+
+    def test_multiplexer_partial_line(self):
+        read_fd, write_fd = os.pipe()
+        stream = self.multiplexer.add(
+            LogStream(self.logger, ERROR, os.fdopen(read_fd, "rb"), self.extra)
+        )
+
+        os.write(write_fd, b"line 1\npartial")
+        time.sleep(PARTIAL_LINE_TIMEOUT + 0.5)
+        self.assertEqual([(ERROR, "line 1"), (ERROR, "partial")], self.messages())
+
+        os.close(write_fd)
+        stream.wait_close()
+        self.assertEqual([(ERROR, "line 1"), (ERROR, "partial")], self.messages())
+
+    def test_multiplexer_unaligned_chunks(self):
+        read_fd, write_fd = os.pipe()
+        stream = self.multiplexer.add(
+            LogStream(self.logger, INFO, os.fdopen(read_fd, "rb"), self.extra)
+        )
+
+        lines = [f"line {i:05d} ".ljust(98, "x") for i in range(2000)]
+        data = "".join(f"{line}\n" for line in lines).encode()
+
+        # blocks end mid-line and are spread over more than PARTIAL_LINE_TIMEOUT
+        end = time.monotonic() + PARTIAL_LINE_TIMEOUT * 3
+        for pos in range(0, len(data), 4096):
+            os.write(write_fd, data[pos : pos + 4096])
+            time.sleep(max(end - time.monotonic(), 0) * 4096 / (len(data) - pos))
+
+        os.close(write_fd)
+        stream.wait_close()
+        self.assertEqual([(INFO, line) for line in lines], self.messages())
+
+    def test_multiplexer_close(self):
+        read_fd, write_fd = os.pipe()
+        stream = self.multiplexer.add(
+            LogStream(self.logger, ERROR, os.fdopen(read_fd, "rb"), self.extra)
+        )
+
+        os.write(write_fd, b"line 1\npartial")
+        time.sleep(0.1)
+        self.multiplexer.close()
+        os.close(write_fd)
+
+        self.assertEqual([(ERROR, "line 1"), (ERROR, "partial")], self.messages())
+        self.assertTrue(stream.stream.closed)
+
+    def test_multiplexer_failing_filter(self):
+        failures = [RuntimeError("filter failed")]
+
+        def failing_filter(record):
+            if failures:
+                raise failures.pop()
+            return True
+
+        self.logger.addFilter(failing_filter)
+
+        first = self.multiplexer.add(
+            LogStream(self.logger, INFO, self.pipe(b"lost\n"), self.extra)
+        )
+        first.wait_close()
+
+        second = self.multiplexer.add(
+            LogStream(self.logger, INFO, self.pipe(b"logged\n"), self.extra)
+        )
+        second.wait_close()
+
+        self.assertTrue(first.stream.closed)
+        self.assertTrue(second.stream.closed)
+        self.assertEqual(
+            [(ERROR, "Something went wrong while logging"), (INFO, "logged")],
+            self.messages(),
+        )